@@ -1,8 +1,14 @@
 import os
-from flask import Flask, request, jsonify
+import shutil
+import tempfile
+import signal
+import uuid
+import multiprocessing
+import orjson
+from flask import Flask, Response, request, jsonify, stream_with_context
 from .pdf_processor import process_pdf_to_csv
 from .excel_sheet_processor import process_exam_schedule
-from .classroom_finder import find_empty_classrooms
+from .classroom_finder import iter_empty_classrooms
 
 app = Flask(__name__)
 
@@ -18,6 +24,114 @@ def list_files_in_current_directory():
         
     return allfiles
 
+# Werkzeug spools uploads in memory up to this size, and in a temporary file above it.
+WERKZEUG_SPOOL_SIZE = 1024 * 500
+
+def save_upload(uploaded_file, path, chunk_size=1 << 20):
+    """Writes an uploaded file to disk, copying in the kernel when it is backed by a real file."""
+    stream = uploaded_file.stream
+    with open(path, "wb") as f:
+        # Only a spooled upload that has already rolled over has a file descriptor to copy from,
+        # since fileno() would first write a smaller one out to disk.
+        if isinstance(stream, tempfile.SpooledTemporaryFile):
+            offset = stream.tell()
+            size = stream.seek(0, os.SEEK_END)
+            stream.seek(offset)
+            if size > WERKZEUG_SPOOL_SIZE:
+                try:
+                    while sent := os.sendfile(f.fileno(), stream.fileno(), offset, chunk_size):
+                        offset += sent
+                    return
+                except (AttributeError, OSError):
+                    # No sendfile (e.g. Windows), or no file-to-file sendfile (e.g. macOS): copying in chunks.
+                    f.seek(0)
+                    f.truncate()
+        shutil.copyfileobj(stream, f, length=chunk_size)
+
+def remove_file(path):
+    """Deletes a temporary file, tolerating one that is already gone."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Warning: Failed to remove temporary file '{path}': {e}")
+
+# Seconds an Excel/PDF job may run before its worker process is killed.
+PROCESSING_TIMEOUT = int(os.getenv("PROCESSING_TIMEOUT", 300))
+
+# Not forking the threaded server, whose other threads may hold locks the workers would inherit.
+_start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+_mp_context = multiprocessing.get_context(_start_method)
+if _start_method == "forkserver":
+    # Importing pandas once in the fork server, rather than in every worker.
+    _mp_context.set_forkserver_preload([process_exam_schedule.__module__, process_pdf_to_csv.__module__])
+
+def _run_job(conn, fn, args, kwargs):
+    """Worker entry point: runs fn and sends back (succeeded, result or raised exception)."""
+    if hasattr(os, "setsid"):
+        # Leading a new process group, so that a timeout also kills any pdftotext the job started.
+        os.setsid()
+    try:
+        outcome = (True, fn(*args, **kwargs))
+    except Exception as e:
+        outcome = (False, e)
+    try:
+        conn.send(outcome)
+    except Exception:
+        # The result or exception could not be pickled.
+        conn.send((False, RuntimeError(str(outcome[1]))))
+    conn.close()
+
+def _kill_job(process):
+    """Kills a worker process along with its process group, and reaps it."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        # No process groups (e.g. Windows), or the worker has not called setsid yet.
+        process.kill()
+    process.join()
+
+def run_in_worker(fn, *args, **kwargs):
+    """
+    Runs fn in a new worker process, or inline where no process can be started.
+    The worker is killed if it runs for more than PROCESSING_TIMEOUT seconds.
+    """
+    receiver, sender = _mp_context.Pipe(duplex=False)
+    process = _mp_context.Process(target=_run_job, args=(sender, fn, args, kwargs), daemon=True)
+    try:
+        process.start()
+    except (OSError, NotImplementedError):
+        # Some runtimes (e.g. AWS Lambda, behind Vercel) cannot start worker processes.
+        receiver.close()
+        sender.close()
+        return fn(*args, **kwargs)
+    # Closing this end here, so the pipe reports EOF if the worker dies without answering.
+    sender.close()
+
+    with receiver:
+        if not receiver.poll(PROCESSING_TIMEOUT):
+            _kill_job(process)
+            raise TimeoutError(f"processing exceeded {PROCESSING_TIMEOUT}s")
+        try:
+            succeeded, result = receiver.recv()
+        except EOFError:
+            # The worker died (e.g. OOM-killed) before sending its result.
+            process.join()
+            raise RuntimeError(
+                f"processing worker exited unexpectedly (exit code {process.exitcode})"
+            ) from None
+    process.join()
+
+    if not succeeded:
+        raise result
+    return result
+
+def temp_output_path(path):
+    """Returns a unique path next to path, for a job to write to before replacing path."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{uuid.uuid4().hex}{ext}"
+
 # Define paths using environment variables with defaults.
 UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "/tmp/data")
 classrooms_list_path = os.getenv(
@@ -30,8 +144,7 @@ pdftotext_path = os.getenv(
 )
 
 # Ensuring upload folder exists.
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 
@@ -43,24 +156,29 @@ def upload_excel():
 
     excel_file = request.files["excel"]
     excel_path = os.path.join(app.config["UPLOAD_FOLDER"], excel_file.filename)
-    excel_file.save(excel_path)
+    save_upload(excel_file, excel_path)
 
     csv_output_path = os.path.join(app.config["UPLOAD_FOLDER"], "scraped_sheet.csv")
+    # Writing to a per-request file, moved onto the shared CSV path only once the job succeeds.
+    temp_csv_path = temp_output_path(csv_output_path)
 
     try:
-        process_exam_schedule(excel_path, output_csv_path=csv_output_path)
+        run_in_worker(process_exam_schedule, excel_path, output_csv_path=temp_csv_path)
     except Exception as e:
-        # Cleaning up uploaded file in case of processing failure.
-        os.remove(excel_path)
+        # Cleaning up uploaded and partly written files in case of processing failure.
+        remove_file(excel_path)
+        remove_file(temp_csv_path)
         return jsonify({"error": f"Failed to process Excel file: {str(e)}"}), 500
 
-    if not os.path.exists(csv_output_path):
+    if not os.path.exists(temp_csv_path):
         # Cleaning up uploaded file if CSV generation failed.
-        os.remove(excel_path)
+        remove_file(excel_path)
         return jsonify({"error": "Failed to generate CSV file"}), 500
 
+    os.replace(temp_csv_path, csv_output_path)
+
     # Deleting uploaded Excel file after processing.
-    os.remove(excel_path)
+    remove_file(excel_path)
 
     return jsonify(
         {
@@ -77,7 +195,7 @@ def upload_pdf():
 
     pdf_file = request.files["pdf"]
     pdf_path = os.path.join(app.config["UPLOAD_FOLDER"], pdf_file.filename)
-    pdf_file.save(pdf_path)
+    save_upload(pdf_file, pdf_path)
 
     csv_output_path = os.path.join(app.config["UPLOAD_FOLDER"], "scraped_pdf.csv")
 
@@ -88,20 +206,25 @@ def upload_pdf():
     )
 
 
+    # Writing to a per-request file, moved onto the shared CSV path only once the job succeeds.
+    temp_csv_path = temp_output_path(csv_output_path)
+
     try:
-        process_pdf_to_csv(
+        run_in_worker(
+            process_pdf_to_csv,
             file_path=pdf_path,
-            csv_path=csv_output_path,
+            csv_path=temp_csv_path,
             pdftotext_path=pdftotext_path,
-            upload_folder=app.config["UPLOAD_FOLDER"],
         )
+        os.replace(temp_csv_path, csv_output_path)
     except Exception as e:
-        # Cleaning up the uploaded PDF file in case of processing failure.
-        os.remove(pdf_path)
+        # Cleaning up the uploaded PDF and partly written CSV files in case of processing failure.
+        remove_file(pdf_path)
+        remove_file(temp_csv_path)
         return jsonify({"error": f"Failed to process PDF: {str(e)}, {os.getcwd()}, {list_files_in_current_directory()}"}), 500
 
     # Deleting uploaded PDF file after processing.
-    os.remove(pdf_path)
+    remove_file(pdf_path)
 
     return jsonify(
         {"message": "PDF processed successfully!", "csv_file": csv_output_path},
@@ -131,7 +254,7 @@ def empty_classrooms():
         return jsonify({"message": "Data not yet available"}), 200
     
     try:
-        empty_classrooms_per_time = find_empty_classrooms(
+        empty_classrooms_per_time = iter_empty_classrooms(
             scraped_sheet_csv_path,
             scraped_pdf_csv_path,
             classrooms_list_path
@@ -145,13 +268,18 @@ def empty_classrooms():
 
     # Cleaning up temporary files.
     for file_path in [pdf_csv, sheet_csv]:
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception as e:
-                print(f"Warning: Failed to remove temporary file '{file_path}': {e}")
-
-    return jsonify(empty_classrooms_per_time)
+        remove_file(file_path)
+
+    # Streaming the JSON object one time slot at a time, serialized with orjson.
+    def generate():
+        yield b"{"
+        for index, (time_slot, classrooms) in enumerate(empty_classrooms_per_time):
+            if index:
+                yield b","
+            yield orjson.dumps(time_slot) + b":" + orjson.dumps(classrooms)
+        yield b"}"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
 
 
 @app.route("/")
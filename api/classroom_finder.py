@@ -1,18 +1,100 @@
+import numpy as np
 import pandas as pd
 import os
+from functools import lru_cache
+from itertools import takewhile
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow is optional; the CSVs are then read with pandas' C parser.
+    pa = None
 
-def find_empty_classrooms(scraped_sheet_csv_path, scraped_pdf_csv_path, classrooms_list_path):
+
+def read_csv_columns(csv_path, columns):
+    """
+    Reads the given columns of a CSV file, keeping every value as a verbatim string.
+
+    pyarrow's multithreaded parser is used when it is installed. It is called directly,
+    since pandas' pyarrow engine infers types before applying dtype, turning e.g. room
+    "0301" into "301" and time slot "09:00" into "09:00:00".
+
+    Parameters:
+    - csv_path (str): Path to the CSV file.
+    - columns (list): Names of the columns to read.
+
+    Returns:
+    - DataFrame: The requested columns, as strings (missing values as NA).
+    """
+    if pa is None:
+        return pd.read_csv(csv_path, usecols=columns, dtype='string')
+
+    table = pa_csv.read_csv(
+        csv_path,
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types={column: pa.string() for column in columns},
+            strings_can_be_null=True,
+        ),
+    )
+    return table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+
+
+def load_classrooms(classrooms_list_path):
+    """
+    Loads the list of classrooms, reusing the parsed result until the file changes.
+
+    Parameters:
+    - classrooms_list_path (str): Path to the classrooms.txt file containing the list of classrooms.
+
+    Returns:
+    - tuple: The classrooms listed before the 'Locked:' marker, in file order.
+    """
+    try:
+        mtime_ns = os.stat(classrooms_list_path).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Classrooms list file not found at '{classrooms_list_path}'")
+
+    # Keying the cache on the modification time so an edited file is re-read.
+    return _load_classrooms(classrooms_list_path, mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _load_classrooms(classrooms_list_path, mtime_ns):
+    """
+    Parses classrooms.txt (each line is a classroom). Cached per path and modification time.
+
+    Parameters:
+    - classrooms_list_path (str): Path to the classrooms.txt file.
+    - mtime_ns (int): Modification time of the file, used only as part of the cache key.
+
+    Returns:
+    - tuple: The classrooms listed before the 'Locked:' marker, in file order.
+    """
+    try:
+        with open(classrooms_list_path, 'rb', buffering=1 << 16) as f:
+            # Stopping at the 'Locked:' marker and skipping blank lines in one pass, on raw bytes
+            # so only the kept classroom names are decoded.
+            unlocked_lines = takewhile(lambda line: b"Locked:" not in line, f)
+            return tuple(line.decode('utf-8') for line in map(bytes.strip, unlocked_lines) if line)
+    except Exception as e:
+        raise RuntimeError(f"Failed to read classrooms list from '{classrooms_list_path}': {e}")
+
+
+def iter_empty_classrooms(scraped_sheet_csv_path, scraped_pdf_csv_path, classrooms_list_path):
     """
     Identifies empty classrooms for each time slot based on the scraped exam schedules.
 
+    The input files are read and validated up front, so any error is raised by this call
+    itself; the empty classrooms are then computed lazily, one time slot at a time.
+
     Parameters:
     - scraped_sheet_csv_path (str): Path to the CSV file generated from the Excel upload.
     - scraped_pdf_csv_path (str): Path to the CSV file generated from the PDF upload.
     - classrooms_list_path (str): Path to the classrooms.txt file containing the list of classrooms.
 
     Returns:
-    - dict: A dictionary where keys are time slots and values are lists of empty classrooms.
+    - generator: Yields (time slot, list of empty classrooms) tuples, sorted by time slot.
     """
     # Checking if scraped_sheet CSV exists.
     if not os.path.exists(scraped_sheet_csv_path):
@@ -22,66 +104,87 @@ def find_empty_classrooms(scraped_sheet_csv_path, scraped_pdf_csv_path, classroo
     if not os.path.exists(scraped_pdf_csv_path):
         raise FileNotFoundError(f"Scraped PDF CSV file not found at '{scraped_pdf_csv_path}'")
 
-    # Reading first CSV file (from Excel upload).
+    # Reading first CSV file (from Excel upload), keeping only the columns used below.
     try:
-        df1 = pd.read_csv(scraped_sheet_csv_path)
+        df1 = read_csv_columns(scraped_sheet_csv_path, ['Course Code', 'Section', 'Time Slot'])
     except Exception as e:
         raise RuntimeError(f"Failed to read scraped sheet CSV '{scraped_sheet_csv_path}': {e}")
 
-    # Reading second CSV file (from PDF upload).
+    # Reading second CSV file (from PDF upload), keeping only the columns used below.
     try:
-        df2 = pd.read_csv(scraped_pdf_csv_path)
+        df2 = read_csv_columns(scraped_pdf_csv_path, ['Course Code', 'Section', 'Room'])
     except Exception as e:
         raise RuntimeError(f"Failed to read scraped PDF CSV '{scraped_pdf_csv_path}': {e}")
 
-    # Merging the two dataframes on 'Course Code' and 'Section'.
+    # Merging the two dataframes on 'Course Code' and 'Section', carrying only 'Time Slot' and 'Room'.
+    # Duplicate rows (e.g. the same exam on several dates) are dropped first, since they would only
+    # multiply the rows of the many-to-many merge without adding any (time slot, room) pair.
     try:
-        merged_df = pd.merge(df1, df2, on=['Course Code', 'Section'])
+        merged_df = pd.merge(
+            df1[['Course Code', 'Section', 'Time Slot']].drop_duplicates(),
+            df2[['Course Code', 'Section', 'Room']].drop_duplicates(),
+            on=['Course Code', 'Section'],
+            sort=False
+        )
     except KeyError as e:
         raise RuntimeError(f"Missing expected columns during merge: {e}")
     except Exception as e:
         raise RuntimeError(f"Error during merging CSV files: {e}")
 
     # Reading classroom list txt file (each line is a classroom).
-    if not os.path.exists(classrooms_list_path):
-        raise FileNotFoundError(f"Classrooms list file not found at '{classrooms_list_path}'")
+    classrooms_list = load_classrooms(classrooms_list_path)
 
-    classrooms_list = []
-    try:
-        with open(classrooms_list_path, 'r') as f:
-            for line in f:
-                if "Locked:" in line:
-                    break
-                classroom = line.strip()
-                if classroom:
-                    classrooms_list.append(classroom)
-    except Exception as e:
-        raise RuntimeError(f"Failed to read classrooms list from '{classrooms_list_path}': {e}")
-
-    # Getting the unique combinations of classrooms and times from the 'Room' and 'Time Slot' columns.
+    # Collecting the set of occupied classrooms per time slot.
     if 'Room' not in merged_df.columns or 'Time Slot' not in merged_df.columns:
         raise RuntimeError("Merged CSV does not contain 'Room' or 'Time Slot' columns")
 
-    unique_classrooms_times = merged_df[['Room', 'Time Slot']].drop_duplicates()
+    # Encoding time slots as sorted integer codes (missing slots get -1 and are dropped).
+    slot_codes, time_slots = pd.factorize(merged_df['Time Slot'], sort=True)
+    rooms = merged_df['Room'].to_numpy()
+    has_slot = slot_codes >= 0
+    slot_codes, rooms = slot_codes[has_slot], rooms[has_slot]
+
+    # Ordering rows by time slot and splitting the rooms wherever the slot code changes.
+    order = np.argsort(slot_codes, kind='stable')
+    slot_codes, rooms = slot_codes[order], rooms[order]
+    boundaries = np.flatnonzero(np.diff(slot_codes)) + 1
+    occupied_per_time = [set(slot_rooms) for slot_rooms in np.split(rooms, boundaries)]
 
-    # Creating a dictionary to store empty classrooms per time slot.
-    empty_classrooms_per_time = {}
+    return _iter_empty_classrooms_per_time(time_slots, occupied_per_time, classrooms_list)
+
+
+def _iter_empty_classrooms_per_time(time_slots, occupied_per_time, classrooms_list):
+    """
+    Yields the empty classrooms for each time slot as it is computed.
 
-    # Getting the unique time slots from the 'Time Slot' column.
-    unique_times = merged_df['Time Slot'].unique()
+    Parameters:
+    - time_slots (Index): Sorted unique time slots.
+    - occupied_per_time (list): Set of occupied classrooms for each time slot.
+    - classrooms_list (tuple): All known classrooms.
 
-    # Identifying empty classrooms for each time slot.
-    for time in unique_times:
-        occupied_classrooms = unique_classrooms_times[unique_classrooms_times['Time Slot'] == time]['Room'].tolist()
+    Returns:
+    - generator: Yields (time slot, list of empty classrooms) tuples.
+    """
+    # Identifying empty classrooms for each time slot, keeping the classrooms.txt order.
+    for time, occupied_classrooms in zip(time_slots, occupied_per_time):
         empty_classrooms = [classroom for classroom in classrooms_list if classroom not in occupied_classrooms]
 
-        # Assign the list of empty classrooms to the current time slot.
-        empty_classrooms_per_time[time] = empty_classrooms
+        yield time, empty_classrooms
+
 
-    # Sorting the dictionary by time slots for consistency.
-    empty_classrooms_per_time = dict(sorted(empty_classrooms_per_time.items()))
+def find_empty_classrooms(scraped_sheet_csv_path, scraped_pdf_csv_path, classrooms_list_path):
+    """
+    Identifies empty classrooms for each time slot based on the scraped exam schedules.
 
-    return empty_classrooms_per_time
+    Parameters:
+    - scraped_sheet_csv_path (str): Path to the CSV file generated from the Excel upload.
+    - scraped_pdf_csv_path (str): Path to the CSV file generated from the PDF upload.
+    - classrooms_list_path (str): Path to the classrooms.txt file containing the list of classrooms.
+
+    Returns:
+    - dict: A dictionary where keys are time slots and values are lists of empty classrooms.
+    """
+    return dict(iter_empty_classrooms(scraped_sheet_csv_path, scraped_pdf_csv_path, classrooms_list_path))
 
 
 if __name__ == "__main__":
@@ -92,8 +195,7 @@ if __name__ == "__main__":
     classrooms_list_path = os.getenv('CLASSROOMS_FILE_PATH', os.path.join(os.getcwd(), "data/classrooms.txt"))
 
     # Ensuring the upload folder exists
-    if not os.path.exists(UPLOAD_FOLDER):
-        os.makedirs(UPLOAD_FOLDER)
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
     try:
         empty_classrooms = find_empty_classrooms(scraped_sheet_csv_path, scraped_pdf_csv_path, classrooms_list_path)
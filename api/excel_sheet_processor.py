@@ -1,6 +1,32 @@
 import os
 import re
 import pandas as pd
+from functools import lru_cache
+from importlib.util import find_spec
+
+# Reading workbooks with the Rust-based calamine engine when it is installed (pandas >= 2.2),
+# and otherwise letting pandas pick the engine from the file extension.
+if find_spec('python_calamine') is not None:
+    EXCEL_READ_OPTIONS = {'engine': 'calamine'}
+else:
+    EXCEL_READ_OPTIONS = {}
+
+# Compiling the course-string patterns once at import, rather than on every cell.
+COURSE_CODE_PATTERN = re.compile(r"[A-Z]{2,4}\d{4}")
+BACHELOR_PATTERN = re.compile(
+    r"\b[A-Z]{2,4}\("  # 2 to 4 uppercase letters + opening parenthesis (e.g. CY().
+    r"([A-Z]{2,4})\)\s*"  # 2 to 4 uppercase letters inside parentheses (e.g. CY).
+    r"[-\s]*\(?([A-Z,]+)\)?"  # Hyphen or space + optional parentheses + uppercase letters or commas (e.g. CY-ABC,DEF).
+)
+MASTER_PATTERN = re.compile(
+    r"\b"  # Word boundary to ensure proper match.
+    r"(M[A-Z]{2,4})"  # 'M' followed by 2 to 4 uppercase letters (e.g., MDS).
+    r"(?:\([A-Z]{2,4}\))?"  # Optional parentheses with 2 to 4 uppercase letters (e.g., (DS)).
+    r"-"  # Hyphen separating department and section.
+    r"([A-Z0-9]+)"  # One or more uppercase letters or digits (e.g., 3A).
+)
+PARENTHESES_PATTERN = re.compile(r"[()]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
 
 
 def extract_course_code(course_str):
@@ -14,7 +40,7 @@ def extract_course_code(course_str):
     str or None: The extracted course code if found, else None.
     """
     # Extracting course code using regex.
-    course_code_match = re.search(r"[A-Z]{2,4}\d{4}", course_str)
+    course_code_match = COURSE_CODE_PATTERN.search(course_str)
     return course_code_match.group(0) if course_code_match else None
 
 
@@ -28,13 +54,8 @@ def extract_bachelor_matches(course_str):
     Returns:
     list: A list of tuples with department codes and sections.
     """
-    # Regex pattern to capture bachelor's department and sections.
-    pattern = re.compile(
-        r"\b[A-Z]{2,4}\("  # 2 to 4 uppercase letters + opening parenthesis (e.g. CY().
-        r"([A-Z]{2,4})\)\s*"  # 2 to 4 uppercase letters inside parentheses (e.g. CY).
-        r"[-\s]*\(?([A-Z,]+)\)?"  # Hyphen or space + optional parentheses + uppercase letters or commas (e.g. CY-ABC,DEF).
-    )
-    return pattern.findall(course_str)
+    # Capturing bachelor's department and sections.
+    return BACHELOR_PATTERN.findall(course_str)
 
 
 def extract_master_matches(course_str):
@@ -47,15 +68,8 @@ def extract_master_matches(course_str):
     Returns:
     list: A list of tuples with department codes and sections.
     """
-    # Regex pattern to capture master's department and sections.
-    pattern = re.compile(
-        r"\b"  # Word boundary to ensure proper match.
-        r"(M[A-Z]{2,4})"  # 'M' followed by 2 to 4 uppercase letters (e.g., MDS).
-        r"(?:\([A-Z]{2,4}\))?"  # Optional parentheses with 2 to 4 uppercase letters (e.g., (DS)).
-        r"-"  # Hyphen separating department and section.
-        r"([A-Z0-9]+)"  # One or more uppercase letters or digits (e.g., 3A).
-    )
-    return pattern.findall(course_str)
+    # Capturing master's department and sections.
+    return MASTER_PATTERN.findall(course_str)
 
 
 def process_bachelor_matches(matches):
@@ -70,17 +84,13 @@ def process_bachelor_matches(matches):
     """
     departments_sections = []
     for dept_code, sections_str in matches:
-        if sections_str:
-            # Splitting sections string by commas or spaces.
-            sections = re.split(r"[,\s]+", sections_str)
-            for sec in sections:
-                # Exclude empty strings and 'R' for Repeaters.
-                sec = sec.strip()
-                if sec and "R" not in sec:
-                    # Splitting concatenated sections like 'ABC' into ['A', 'B', 'C'].
-                    for char in sec:
-                        if char != "R" and char.isalpha():
-                            departments_sections.append(f"{dept_code}-{char}")
+        # BACHELOR_PATTERN only captures uppercase letters and commas, so splitting on commas suffices.
+        for sec in sections_str.split(","):
+            # Excluding empty strings and groups containing 'R' for Repeaters.
+            if sec and "R" not in sec:
+                # Splitting concatenated sections like 'ABC' into ['A', 'B', 'C'].
+                for char in sec:
+                    departments_sections.append(f"{dept_code}-{char}")
     return departments_sections
 
 
@@ -97,7 +107,7 @@ def process_master_matches(matches):
     departments_sections = []
     for dept_code_raw, section_str in matches:
         # Removing parentheses and merge department codes, e.g., 'MS(DS)' to 'MDS'.
-        dept_code = re.sub(r"\(|\)", "", dept_code_raw)
+        dept_code = PARENTHESES_PATTERN.sub("", dept_code_raw)
         if section_str:
             # Directly concatenate department code with section.
             departments_sections.append(f"{dept_code}-{section_str}")
@@ -107,21 +117,28 @@ def process_master_matches(matches):
     return departments_sections
 
 
+@lru_cache(maxsize=4096)
 def extract_course_info(course_str):
     """
     Extracts course information including course code, departments, and sections.
+    Cached per cell string, since the same course cell can repeat across the schedule.
 
     Parameters:
     course_str (str): The string containing course information.
 
     Returns:
-    tuple: A tuple containing the course code and a list of department-section pairs.
+    tuple: A tuple containing the course code and a tuple of department-section pairs
+    (None and an empty tuple if the string holds no course code).
     """
+    # Skipping cells without a course code, whose sections would be discarded anyway.
+    # Whitespace never occurs inside a course code, so this can run before cleaning.
+    course_code = extract_course_code(course_str)
+    if course_code is None:
+        return None, ()
+
     # Cleaning course string to handle irregular formats and line breaks.
-    course_str = course_str.replace("\n", " ")  # Remove line breaks
-    course_str = re.sub(r"\s+", " ", course_str)  # Normalize spaces
+    course_str = WHITESPACE_PATTERN.sub(" ", course_str)  # Normalize spaces and line breaks
 
-    course_code = extract_course_code(course_str)
     bachelor_matches = extract_bachelor_matches(course_str)
     master_matches = extract_master_matches(course_str)
 
@@ -130,8 +147,8 @@ def extract_course_info(course_str):
         master_matches
     ) + process_bachelor_matches(bachelor_matches)
 
-    # Removing duplicates to ensure each department-section pair is unique.
-    departments_sections = list(set(departments_sections))
+    # Removing duplicates to ensure each department-section pair is unique, keeping first-seen order.
+    departments_sections = tuple(dict.fromkeys(departments_sections))
 
     return course_code, departments_sections
 
@@ -146,47 +163,51 @@ def extract_day_time_course_info(df):
     Returns:
     list: A list of dictionaries containing extracted information (date, time slot, course code, section).
     """
+    # Pulling the cells out once as a 2D object array, so each lookup is a plain element load.
+    cells = df.to_numpy(dtype=object)
+    n_rows, n_cols = cells.shape
+
     time_slots_row_index = 0
-    time_slots = {}
 
-    # Iterating through each column starting from column index 1.
-    for col_index in range(1, df.shape[1]):
-        # Extracting time slot from the first row.
-        time_slot = df.iloc[time_slots_row_index, col_index]
-        if pd.notna(time_slot):
-            time_slots[col_index] = time_slot
+    # Keeping only the columns whose first-row time slot is present, checked once for the whole row.
+    header = cells[time_slots_row_index]
+    slot_columns = [
+        (col_index, time_slot)
+        for col_index, time_slot, present in zip(range(1, n_cols), header[1:], pd.notna(header[1:]))
+        if present and time_slot
+    ]
+
+    # Flagging rows that start a new date, in a single vectorized check of the first column.
+    has_date = pd.notna(cells[:, 0])
 
     # Initializing variables to store extracted information.
     extracted_data = []
     current_date = None
 
     # Iterating through each row starting from row index 1.
-    for index in range(time_slots_row_index + 1, len(df)):
-        row = df.iloc[index]
+    for index in range(time_slots_row_index + 1, n_rows):
+        row = cells[index]
 
         # Extracting date from the first column.
-        if pd.notna(row[0]):
+        if has_date[index]:
             current_date = row[0]
 
-        # Iterating through each column starting from column index 1.
-        for col_index in range(1, df.shape[1]):
+        # Iterating through the columns that have a time slot.
+        for col_index, time_slot in slot_columns:
             course_data = row[col_index]
             if isinstance(course_data, str):
-                # Getting time slot corresponding to this column.
-                time_slot = time_slots.get(col_index)
-                if time_slot:
-                    # Extracting course code, sections.
-                    course_code, departments_sections = extract_course_info(course_data)
-                    if course_code and departments_sections:
-                        for section in departments_sections:
-                            extracted_data.append(
-                                {
-                                    "Date": current_date,
-                                    "Time Slot": time_slot,
-                                    "Course Code": course_code,
-                                    "Section": section,
-                                }
-                            )
+                # Extracting course code, sections.
+                course_code, departments_sections = extract_course_info(course_data)
+                if course_code and departments_sections:
+                    for section in departments_sections:
+                        extracted_data.append(
+                            {
+                                "Date": current_date,
+                                "Time Slot": time_slot,
+                                "Course Code": course_code,
+                                "Section": section,
+                            }
+                        )
 
     return extracted_data
 
@@ -211,7 +232,7 @@ def process_exam_schedule(file_path, sheet_name="FSC", output_csv_path=None):
     # Loading and cleaning the DataFrame.
     try:
         df_cleaned = (
-            pd.read_excel(file_path, sheet_name=sheet_name)
+            pd.read_excel(file_path, sheet_name=sheet_name, **EXCEL_READ_OPTIONS)
             .dropna(how="all")
             .iloc[2:]
             .reset_index(drop=True)
@@ -238,8 +259,7 @@ if __name__ == "__main__":
     scraped_sheet_csv_path = os.getenv('SCRAPED_SHEET_CSV_PATH', os.path.join(upload_folder, 'scraped_sheet.csv'))
 
     # Ensuring the upload folder exists.
-    if not os.path.exists(upload_folder):
-        os.makedirs(upload_folder)
+    os.makedirs(upload_folder, exist_ok=True)
 
     try:
         process_exam_schedule(exam_schedule_file_path, "FSC", scraped_sheet_csv_path)
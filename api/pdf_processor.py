@@ -2,119 +2,308 @@ import os
 import re
 import csv
 import subprocess
+import threading
+from collections import defaultdict
 
-# Precompiled regex patterns (unchanged)
-SEMESTER_SECTION_PATTERN = re.compile(r"(\d+)([A-Z])")
-ROOM_COURSE_PATTERN = re.compile(
-    rf"([A-Z]{{2}}\d{{4}})"  # Course code: e.g., "CS1234"
-    rf"\s*-\s*"               # Separator: " - "
-    rf"([\w\s]+)"             # Course name: e.g., "Introduction to CS"
-    rf"\s+"                   # Space separator
-    rf"([A-Z]{{3}}-\d+[A-Z]?)"  # Section: e.g., "MDS-3A"
-    rf"\s+"                   # Space separator
-    rf"(?:Room\sNo\.\s*([\w\d\-]+)"  # Room number: e.g., "B-230"
-    rf"|([A-Za-z]+\sLab-[IVX]+))"   # Lab name: e.g., "Rawal Lab-III"
-    rf"(?:\s+\d+(?:st|nd|rd|th)\s+Floor)",  # Floor info: e.g., "5th Floor"
-    re.IGNORECASE,
-)
-
-def extract_text_with_pdftotext(file_path, pdftotext_path, temp_txt_path):
-    """
-    Extracts text from a PDF using the external pdftotext tool.
+try:
+    import hyperscan
+except ImportError:  # Hyperscan is optional (x86-64 only); matching falls back to re alone.
+    hyperscan = None
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # PDFium is only needed when the pdftotext binary cannot be run.
+    pdfium = None
+
+def room_course_regex(course_name):
+    """
+    Builds the room-course regex around the given course name sub-pattern.
+
+    Args:
+        course_name (str): Regex for the course name between the code and the section.
+
+    Returns:
+        str: The full room-course regex, with named groups.
+    """
+    return (
+        rf"(?P<course_code>[A-Z]{{2}}\d{{4}})"  # Course code: e.g., "CS1234"
+        rf"\s*-\s*"               # Separator: " - "
+        rf"(?:{course_name})"     # Course name, not captured: e.g., "Introduction to CS"
+        rf"\s+"                   # Space separator
+        rf"(?:(?P<master_section>M[A-Z]{{2}}-\d+[A-Z]?)"  # Master's section, kept whole: e.g., "MDS-3A"
+        rf"|(?:B(?P<bachelor_department>[A-Z]{{2}})"  # Bachelor's department, "B" dropped: e.g., "BCS" -> "CS"
+        rf"|(?P<department>[A-Z]{{3}}))"  # Other department, kept whole: e.g., "SEC"
+        rf"-(?P<semester>\d+)(?P<section_letter>[A-Z])?)"  # Semester and section: e.g., "-3A"
+        rf"\s+"                   # Space separator
+        rf"(?:Room\sNo\.\s*(?P<room_no>[\w\d\-]+)"  # Room number: e.g., "B-230"
+        rf"|(?P<lab_name>[A-Za-z]+\sLab-[IVX]+))"   # Lab name: e.g., "Rawal Lab-III"
+        rf"(?:\s+\d+(?:st|nd|rd|th)\s+Floor)"  # Floor info: e.g., "5th Floor"
+    )
+
+# Precompiled regex patterns. The course name is lazy and length-bounded so that text
+# without a section after a course code cannot make the engine backtrack far.
+ROOM_COURSE_PATTERN = re.compile(room_course_regex(r"[\w\s]{1,100}?"), re.IGNORECASE)
+
+def compile_hyperscan_database(regex):
+    """
+    Compiles a case-insensitive regex into a Hyperscan database reporting match starts.
+
+    Args:
+        regex (str): Regex to compile.
+
+    Returns:
+        hyperscan.Database or None: The database, or None if Hyperscan is not installed.
+    """
+    if hyperscan is None:
+        return None
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[regex.encode('ascii')],
+        ids=[0],
+        elements=1,
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST],
+    )
+    return database
+
+# Hyperscan cannot track match starts through the bounded course name, so it matches the
+# unbounded form instead. That accepts every ROOM_COURSE_PATTERN match, which re then confirms.
+ROOM_COURSE_DATABASE = compile_hyperscan_database(room_course_regex(r"[\w\s]+"))
+
+# Hyperscan scratch space must not be shared between threads.
+_hyperscan_local = threading.local()
+
+# Streaming scan sizes: matches are searched for once this much normalized text is buffered,
+# and the last SCAN_TAIL_SIZE characters are held back in case a match straddles two reads.
+SCAN_CHUNK_SIZE = 1 << 16
+SCAN_TAIL_SIZE = 1024
+
+def iter_normalized_lines(lines):
+    """
+    Normalizes the whitespace of extracted lines of text, dropping blank ones.
+
+    Args:
+        lines (iterable): Raw lines of extracted text.
+
+    Returns:
+        generator: Yields each non-empty line with runs of whitespace collapsed to one space.
+    """
+    for line in lines:
+        line = ' '.join(line.split())
+        if line:
+            yield line
+
+def iter_text_with_pdftotext(file_path, pdftotext_path):
+    """
+    Streams text from a PDF using the external pdftotext tool.
 
     Args:
         file_path (str): Path to the PDF file.
         pdftotext_path (str): Path to the pdftotext binary.
-        temp_txt_path (str): Path to store the temporary extracted text.
 
     Returns:
-        str: Cleaned extracted text.
+        generator: Yields each non-empty line of text with whitespace normalized.
+    """
+    # Execute pdftotext command, reading the text from its stdout ("-")
+    try:
+        proc = subprocess.Popen(
+            [pdftotext_path, '-layout', '-nopgbrk', file_path, '-'],
+            stdout=subprocess.PIPE,
+            encoding='utf-8',
+            bufsize=SCAN_CHUNK_SIZE,
+        )
+    except OSError as e:
+        # Missing binary, or one built for another platform: extract with PDFium instead.
+        if pdfium is None:
+            raise RuntimeError(f"pdftotext binary could not be run from '{pdftotext_path}': {e}")
+        yield from iter_text_with_pdfium(file_path)
+        return
+
+    with proc:
+        yield from iter_normalized_lines(proc.stdout)
+
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"Error during pdftotext execution: exited with status {proc.returncode}"
+        )
+
+def iter_text_with_pdfium(file_path):
+    """
+    Streams text from a PDF page by page using PDFium (pypdfium2).
+
+    Args:
+        file_path (str): Path to the PDF file.
+
+    Returns:
+        generator: Yields each non-empty line of text with whitespace normalized.
     """
-    # Execute pdftotext command
     try:
-        subprocess.run([pdftotext_path, '-layout', file_path, temp_txt_path], check=True)
-        with open(temp_txt_path, 'r', encoding='utf-8') as f:
-            text = f.read()
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Error during pdftotext execution: {e}")
-    except FileNotFoundError as e:
-        raise RuntimeError(f"pdftotext binary not found at '{pdftotext_path}': {e}")
+        pdf = pdfium.PdfDocument(file_path)
+    except (pdfium.PdfiumError, OSError) as e:
+        # A missing or unreadable file raises OSError rather than PdfiumError.
+        raise RuntimeError(f"Failed to open PDF '{file_path}': {e}")
+
+    try:
+        for page in pdf:
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+
+            yield from iter_normalized_lines(text.splitlines())
     finally:
-        # Clean up temporary file
-        if os.path.exists(temp_txt_path):
-            os.remove(temp_txt_path)
+        pdf.close()
+
+def iter_room_course_matches(lines):
+    """
+    Scans streamed lines of text for room-course matches without joining the whole text.
 
-    # Normalize whitespace
-    return ' '.join(text.split())
+    Args:
+        lines (iterable): Lines of text with whitespace normalized.
 
-def normalize_section(section_str):
+    Returns:
+        generator: Yields ROOM_COURSE_PATTERN match objects, in text order.
     """
-    Normalizes the section string by removing certain prefixes and numerical parts.
+    # Lines are collected and joined once per chunk, rather than appended to a growing string.
+    parts = []
+    length = 0
+    for line in lines:
+        parts.append(line)
+        length += len(line) + 1
+        if length <= SCAN_CHUNK_SIZE:
+            continue
+
+        buffer = ' '.join(parts)
+        # Matches reaching into the tail may continue in the next line, so rescan them later.
+        keep_from = len(buffer) - SCAN_TAIL_SIZE
+        for match in find_room_courses(buffer):
+            if match.end() > keep_from:
+                keep_from = match.start()
+                break
+            yield match
+        tail = buffer[keep_from:]
+        parts = [tail] if tail else []
+        length = len(tail) + 1 if tail else 0
+
+    yield from find_room_courses(' '.join(parts))
+
+def section_from_match(match):
+    """
+    Builds the normalized section from a ROOM_COURSE_PATTERN match.
+
+    Master's sections are kept whole, while other sections keep only their department
+    and section letter (the semester number is kept if there is no letter).
 
     Args:
-        section_str (str): Original section string.
+        match (re.Match): A ROOM_COURSE_PATTERN match.
 
     Returns:
-        str: Normalized section string.
+        str: Normalized section string, e.g. "MDS-3A" or "CS-A".
     """
-    if section_str.startswith("M"):
-        return section_str
-    if section_str.startswith("B"):
-        section_str = section_str[1:]
-    return SEMESTER_SECTION_PATTERN.sub(r"\2", section_str)
+    master_section = match['master_section']
+    if master_section:
+        return master_section
+    department = match['bachelor_department'] or match['department']
+    return f"{department}-{match['section_letter'] or match['semester']}"
 
-def extract_rooms_courses_from_text(text):
+def find_room_courses(text):
     """
-    Maps room numbers to unique courses allocated to them.
+    Finds ROOM_COURSE_PATTERN matches in text, with the same results as finditer.
+
+    When Hyperscan is available it locates the regions that can hold a match, so the
+    backtracking re engine only runs from those regions onwards.
 
     Args:
         text (str): Cleaned extracted text.
 
     Returns:
-        dict: Room numbers as keys and lists of unique courses as values.
+        generator: Yields ROOM_COURSE_PATTERN match objects, in text order.
+    """
+    # Hyperscan offsets are byte offsets, which only line up with str offsets for ASCII text.
+    if ROOM_COURSE_DATABASE is None or not text.isascii():
+        yield from ROOM_COURSE_PATTERN.finditer(text)
+        return
+
+    scratch = getattr(_hyperscan_local, 'scratch', None)
+    if scratch is None:
+        scratch = _hyperscan_local.scratch = hyperscan.Scratch(ROOM_COURSE_DATABASE)
+
+    # Each region spans from the leftmost start of any match ending at its end offset.
+    regions = []
+    ROOM_COURSE_DATABASE.scan(
+        text.encode('ascii'),
+        match_event_handler=lambda _id, start, end, _flags, _context: regions.append((start, end)),
+        scratch=scratch,
+    )
+    regions.sort()
+
+    position = 0
+    for start, end in regions:
+        # Every match lies inside some region, so regions ending before position hold none.
+        if end <= position:
+            continue
+        match = ROOM_COURSE_PATTERN.search(text, max(start, position))
+        if match is None:
+            return
+        yield match
+        position = match.end()
+
+def extract_rooms_courses_from_matches(matches):
+    """
+    Maps room numbers to unique courses allocated to them.
+
+    Args:
+        matches (iterable): ROOM_COURSE_PATTERN match objects.
+
+    Returns:
+        dict: Room numbers as keys and sets of (course code, section) tuples as values.
     """
-    room_course_dict = {}
-    seen_courses = set()
+    room_course_dict = defaultdict(set)
 
-    for match in ROOM_COURSE_PATTERN.finditer(text):
-        course_code, _, section, room_no, lab_name = match.groups()
+    for match in matches:
+        course_code, room_no, lab_name = match.group('course_code', 'room_no', 'lab_name')
         room = room_no if room_no else lab_name
         if not room:
             continue
 
-        normalized_section = normalize_section(section)
-        course_key = (room, course_code, normalized_section)
-        if course_key not in seen_courses:
-            seen_courses.add(course_key)
-            if room in room_course_dict:
-                room_course_dict[room].append((course_code, normalized_section))
-            else:
-                room_course_dict[room] = [(course_code, normalized_section)]
+        room_course_dict[room].add((course_code, section_from_match(match)))
 
     return room_course_dict
 
+def extract_rooms_courses_from_text(text):
+    """
+    Maps room numbers to unique courses allocated to them.
+
+    Args:
+        text (str): Cleaned extracted text.
+
+    Returns:
+        dict: Room numbers as keys and sets of (course code, section) tuples as values.
+    """
+    return extract_rooms_courses_from_matches(find_room_courses(text))
+
 def write_to_csv(data, csv_path):
     """
     Writes the room-course-section data to a CSV file.
 
     Args:
-        data (dict): Room-course-section data.
+        data (dict): Room numbers mapped to sets of (course code, section) tuples.
         csv_path (str): Path to the CSV file.
     """
     try:
-        with open(csv_path, mode="w", newline="", encoding="utf-8") as file:
+        with open(csv_path, mode="w", newline="", encoding="utf-8", buffering=1 << 20) as file:
             writer = csv.writer(file)
             writer.writerow(["Room", "Course Code", "Section"])
-            rows = [
-                [room, course_code, section]
+            writer.writerows(
+                (room, course_code, section)
                 for room, courses in data.items()
-                for course_code, section in courses
-            ]
-            writer.writerows(rows)
+                for course_code, section in sorted(courses)
+            )
     except Exception as e:
         raise RuntimeError(f"Failed to write CSV file '{csv_path}': {e}")
 
-def process_pdf_to_csv(file_path, csv_path, pdftotext_path, upload_folder):
+def process_pdf_to_csv(file_path, csv_path, pdftotext_path):
     """
     Processes a PDF file to extract room-course-section mappings and writes them to a CSV.
 
@@ -122,20 +311,18 @@ def process_pdf_to_csv(file_path, csv_path, pdftotext_path, upload_folder):
         file_path (str): Path to the PDF file.
         csv_path (str): Path to save the processed CSV file.
         pdftotext_path (str): Path to the pdftotext binary.
-        upload_folder (str): Directory for temporary file storage.
 
     Returns:
         None
     """
     file_path = os.path.abspath(file_path)
     csv_path = os.path.abspath(csv_path)
-    temp_txt_path = os.path.join(upload_folder, "extracted_text.txt")
 
-    # Extracting text from PDF
-    text = extract_text_with_pdftotext(file_path, pdftotext_path, temp_txt_path)
+    # Streaming text from PDF
+    lines = iter_text_with_pdftotext(file_path, pdftotext_path)
 
-    # Extracting room-course mappings
-    rooms_courses = extract_rooms_courses_from_text(text)
+    # Extracting room-course mappings as the text arrives
+    rooms_courses = extract_rooms_courses_from_matches(iter_room_course_matches(lines))
 
     # Writing data to CSV
     write_to_csv(rooms_courses, csv_path)
@@ -149,10 +336,9 @@ if __name__ == "__main__":
     scraped_pdf_csv_path = os.getenv('SCRAPED_PDF_CSV_PATH', os.path.join(UPLOAD_FOLDER, 'scraped_pdf.csv'))
 
     # Ensuring upload folder exists
-    if not os.path.exists(UPLOAD_FOLDER):
-        os.makedirs(UPLOAD_FOLDER)
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
     try:
-        process_pdf_to_csv(pdf_file_path, scraped_pdf_csv_path, pdftotext_path, UPLOAD_FOLDER)
+        process_pdf_to_csv(pdf_file_path, scraped_pdf_csv_path, pdftotext_path)
     except Exception as e:
         print(f"Error processing PDF: {e}")
@@ -0,0 +1,106 @@
+import os
+import io
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from api import app as app_module
+from api.app import WERKZEUG_SPOOL_SIZE, run_in_worker, save_upload
+
+
+def write_after(path, delay):
+    """Job that writes path once delay seconds have passed."""
+    time.sleep(delay)
+    with open(path, "w") as f:
+        f.write("late")
+
+
+def slow_process_pdf_to_csv(file_path, csv_path, pdftotext_path):
+    """Stands in for process_pdf_to_csv, writing its CSV only after the timeout."""
+    write_after(csv_path, 1.5)
+
+
+class RunInWorkerTest(unittest.TestCase):
+    """Jobs run in a worker process that is killed on timeout and reported if it dies."""
+
+    def test_returns_result(self):
+        self.assertEqual(run_in_worker(divmod, 7, 2), (3, 1))
+
+    def test_reraises_job_exception(self):
+        with self.assertRaises(ValueError):
+            run_in_worker(int, "not a number")
+
+    def test_timeout_kills_worker(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "scraped.csv")
+            with mock.patch.object(app_module, "PROCESSING_TIMEOUT", 0.5):
+                with self.assertRaisesRegex(TimeoutError, "exceeded 0.5s"):
+                    run_in_worker(write_after, path, 1.5)
+            # A killed job never writes its output late.
+            time.sleep(2)
+            self.assertFalse(os.path.exists(path))
+        # Nothing is left holding a worker, so the next job runs straight away.
+        self.assertEqual(run_in_worker(divmod, 7, 2), (3, 1))
+
+    def test_worker_death_is_reported(self):
+        with self.assertRaisesRegex(RuntimeError, r"exit code 3"):
+            run_in_worker(os._exit, 3)
+        self.assertEqual(run_in_worker(divmod, 7, 2), (3, 1))
+
+    def test_runs_inline_when_no_process_can_start(self):
+        with mock.patch.object(app_module._mp_context, "Process") as process:
+            process.return_value.start.side_effect = OSError("no semaphores")
+            self.assertEqual(run_in_worker(divmod, 7, 2), (3, 1))
+
+
+class UploadTimeoutTest(unittest.TestCase):
+    """A timed-out upload leaves the CSV from an earlier successful upload in place."""
+
+    def test_timed_out_pdf_keeps_previous_csv(self):
+        folder = self.enterContext(tempfile.TemporaryDirectory())
+        csv_path = os.path.join(folder, "scraped_pdf.csv")
+        with open(csv_path, "w") as f:
+            f.write("previous")
+
+        with mock.patch.dict(app_module.app.config, {"UPLOAD_FOLDER": folder}), \
+                mock.patch.object(app_module, "PROCESSING_TIMEOUT", 0.5), \
+                mock.patch.object(app_module, "process_pdf_to_csv", slow_process_pdf_to_csv):
+            response = app_module.app.test_client().post(
+                "/upload_pdf", data={"pdf": (io.BytesIO(b"%PDF"), "plan.pdf")}
+            )
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("exceeded 0.5s", response.get_json()["error"])
+
+        time.sleep(2)
+        with open(csv_path) as f:
+            self.assertEqual(f.read(), "previous")
+        self.assertEqual(sorted(os.listdir(folder)), ["scraped_pdf.csv"])
+
+
+class SaveUploadTest(unittest.TestCase):
+    """Uploads are saved intact, with sendfile used only for ones spooled to disk."""
+
+    def save(self, data):
+        path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), "upload.bin")
+        with app_module.app.test_request_context(
+            "/upload_pdf", method="POST", data={"pdf": (io.BytesIO(data), "plan.pdf")}
+        ):
+            uploaded_file = app_module.request.files["pdf"]
+            with mock.patch.object(os, "sendfile", wraps=os.sendfile) as sendfile:
+                save_upload(uploaded_file, path)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), data)
+        return sendfile
+
+    def test_large_upload_is_sent_from_its_spool_file(self):
+        sendfile = self.save(os.urandom(WERKZEUG_SPOOL_SIZE * 3))
+        self.assertTrue(sendfile.called)
+
+    def test_small_upload_is_copied_from_memory(self):
+        sendfile = self.save(os.urandom(1024))
+        self.assertFalse(sendfile.called)
+
+
+if __name__ == "__main__":
+    unittest.main()
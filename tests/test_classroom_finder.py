@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from api import classroom_finder
+from api.classroom_finder import read_csv_columns
+
+SHEET_CSV = (
+    "Day,Course Code,Section,Time Slot\n"
+    "Monday,CS1234,CS-A,09:00\n"
+    "Monday,CS1234,CS-B,\n"
+    "Tuesday,EE2001,EE-1,1.5\n"
+)
+COLUMNS = ["Course Code", "Section", "Time Slot"]
+EXPECTED = {
+    "Course Code": ["CS1234", "CS1234", "EE2001"],
+    "Section": ["CS-A", "CS-B", "EE-1"],
+    "Time Slot": ["09:00", None, "1.5"],
+}
+
+
+class ReadCsvColumnsTest(unittest.TestCase):
+    """Values are read verbatim, whether or not pyarrow is installed."""
+
+    def setUp(self):
+        folder = self.enterContext(tempfile.TemporaryDirectory())
+        self.csv_path = os.path.join(folder, "scraped_sheet.csv")
+        with open(self.csv_path, "w") as f:
+            f.write(SHEET_CSV)
+
+    def assert_reads_verbatim(self):
+        df = read_csv_columns(self.csv_path, COLUMNS)
+        self.assertEqual(list(df.columns), COLUMNS)
+        for column, values in EXPECTED.items():
+            self.assertEqual([None if pd.isna(v) else v for v in df[column]], values)
+
+    def test_without_pyarrow(self):
+        with mock.patch.object(classroom_finder, "pa", None):
+            self.assert_reads_verbatim()
+
+    @unittest.skipIf(classroom_finder.pa is None, "pyarrow is not installed")
+    def test_with_pyarrow(self):
+        self.assert_reads_verbatim()
+
+    def test_numeric_looking_rooms_stay_strings(self):
+        with open(self.csv_path, "w") as f:
+            f.write("Room,Course Code,Section\n0301,CS1234,CS-A\n007,EE2001,EE-1\n")
+        df = read_csv_columns(self.csv_path, ["Course Code", "Section", "Room"])
+        self.assertEqual(list(df["Room"]), ["0301", "007"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import random
+import unittest
+from unittest import mock
+
+from api import pdf_processor
+from api.pdf_processor import (
+    ROOM_COURSE_PATTERN,
+    extract_rooms_courses_from_matches,
+    iter_room_course_matches,
+)
+
+# Pieces of seating-plan text: whole allocations, allocations cut short, and filler.
+FRAGMENTS = [
+    "CS1234 - Introduction to Computing BCS-3A Room No. B-230 5th Floor",
+    "EE2001 - Circuits MDS-2B Rawal Lab-III 1st Floor",
+    "MT1008 - Calculus SEC-4 Room No. C-101 2nd Floor",
+    "AI3002 - Deep Learning MAI-1 Room No.A-5 3rd Floor",
+    "CS1234 - Introduction to Computing BCS-3A",
+    "CS1234 - Introduction to Computing",
+    "Room No. B-230 5th Floor",
+    "SE3001 - Software Design BSE-5C Margalla Lab-IV",
+    "CS", "1234", "-", "BCS-3A", "Room", "No.", "Floor", "4th",
+    "Seating Plan", "FAST NUCES", "Date", "Time",
+]
+
+
+def make_lines(rng, count):
+    """Builds whitespace-normalized lines from random fragments, split at random points."""
+    words = " ".join(rng.choice(FRAGMENTS) for _ in range(count)).split()
+    lines = []
+    while words:
+        take = rng.randint(1, 12)
+        lines.append(" ".join(words[:take]))
+        words = words[take:]
+    return lines
+
+
+class IterRoomCourseMatchesTest(unittest.TestCase):
+    """The streaming scan must find exactly what finditer finds over the joined text."""
+
+    def assert_matches_finditer(self, lines):
+        expected = list(ROOM_COURSE_PATTERN.finditer(" ".join(lines)))
+        actual = list(iter_room_course_matches(lines))
+        self.assertEqual([m.group(0) for m in actual], [m.group(0) for m in expected])
+        self.assertEqual(
+            extract_rooms_courses_from_matches(actual),
+            extract_rooms_courses_from_matches(expected),
+        )
+
+    def check_sizes(self):
+        rng = random.Random(0)
+        for chunk_size, tail_size in [(1 << 16, 1024), (256, 128), (96, 80), (64, 64)]:
+            with mock.patch.object(pdf_processor, "SCAN_CHUNK_SIZE", chunk_size), \
+                    mock.patch.object(pdf_processor, "SCAN_TAIL_SIZE", tail_size):
+                for _ in range(50):
+                    with self.subTest(chunk_size=chunk_size, tail_size=tail_size):
+                        self.assert_matches_finditer(make_lines(rng, rng.randint(0, 200)))
+
+    def test_without_hyperscan(self):
+        with mock.patch.object(pdf_processor, "ROOM_COURSE_DATABASE", None):
+            self.check_sizes()
+
+    @unittest.skipIf(pdf_processor.ROOM_COURSE_DATABASE is None, "Hyperscan is not installed")
+    def test_with_hyperscan(self):
+        self.check_sizes()
+
+
+class IterTextWithPdfiumTest(unittest.TestCase):
+    @unittest.skipIf(pdf_processor.pdfium is None, "pypdfium2 is not installed")
+    def test_missing_file_raises_runtime_error(self):
+        with self.assertRaisesRegex(RuntimeError, "Failed to open PDF"):
+            list(pdf_processor.iter_text_with_pdfium("/nonexistent/seating_plan.pdf"))
+
+
+if __name__ == "__main__":
+    unittest.main()